@@ -1,5 +1,8 @@
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List
+import operator
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Deque, Dict, List, Optional
 
 from models import AlertRule, AlertEvent, StockPrice
 
@@ -14,37 +17,75 @@ class AlertManager:
     - Keeps a small history of recent events.
     """
 
+    _OPS: Dict[str, Callable[[float, float], bool]] = {
+        ">": operator.gt,
+        "<": operator.lt,
+    }
+
     def __init__(self, rules: Dict[int, AlertRule]):
-        self._rules: Dict[int, AlertRule] = dict(rules)
-        self._events: List[AlertEvent] = []
+        self._rules: Dict[int, AlertRule] = {}
+        # per-rule values resolved once at insert time, keyed by rule id
+        self._op_fns: Dict[int, Callable[[float, float], bool]] = {}
+        self._symbols: Dict[int, str] = {}
+        self._last_ts: Dict[int, float] = {}
+        # rules grouped by upper-cased symbol, so a snapshot only touches
+        # the rules for symbols it actually contains
+        self._rules_by_symbol: Dict[str, List[AlertRule]] = {}
+        # bounded history: appending past 50 drops the oldest event
+        self._events: Deque[AlertEvent] = deque(maxlen=50)
+
+        for rule in rules.values():
+            self.add_rule(rule)
 
     # --------------- rule management ---------------
 
     @property
     def rules(self) -> List[AlertRule]:
-        return list(self._rules.values())
+        rules: List[AlertRule] = []
+        for rule_id, rule in self._rules.items():
+            last_ts = self._last_ts.get(rule_id)
+            if last_ts is not None:
+                last_triggered = datetime.fromtimestamp(last_ts, timezone.utc)
+                rule = rule.model_copy(update={"last_triggered": last_triggered})
+            rules.append(rule)
+        return rules
 
     def add_rule(self, rule: AlertRule) -> None:
+        previous = self._rules.get(rule.id)
+        if previous is not None:
+            # replacing a rule: drop the old one from its symbol group
+            group = self._rules_by_symbol[self._symbols[rule.id]]
+            group.remove(previous)
+
+        symbol = rule.symbol.upper()
         self._rules[rule.id] = rule
+        self._op_fns[rule.id] = self._OPS.get(rule.operator.strip(), self._never)
+        self._symbols[rule.id] = symbol
+        self._rules_by_symbol.setdefault(symbol, []).append(rule)
+
+        if rule.last_triggered is not None:
+            self._last_ts[rule.id] = rule.last_triggered.timestamp()
+        else:
+            self._last_ts.pop(rule.id, None)
 
     def clear_rules(self) -> None:
         self._rules.clear()
+        self._op_fns.clear()
+        self._symbols.clear()
+        self._last_ts.clear()
+        self._rules_by_symbol.clear()
 
     # --------------- evaluation helpers ---------------
 
-    def _condition_met(self, rule: AlertRule, price: float) -> bool:
-        op = rule.operator.strip()
-        if op == ">":
-            return price > rule.threshold
-        if op == "<":
-            return price < rule.threshold
+    @staticmethod
+    def _never(price: float, threshold: float) -> bool:
         return False  # unknown operator
 
-    def _can_trigger(self, rule: AlertRule, now: datetime) -> bool:
-        if rule.last_triggered is None:
+    def _can_trigger(self, rule: AlertRule, now_ts: float) -> bool:
+        last_ts = self._last_ts.get(rule.id)
+        if last_ts is None:
             return True
-        delta = now - rule.last_triggered
-        return delta >= timedelta(seconds=rule.cooldown_seconds)
+        return now_ts - last_ts >= rule.cooldown_seconds
 
     def evaluate(self, prices: List[StockPrice]) -> List[AlertEvent]:
         """
@@ -54,43 +95,41 @@ class AlertManager:
         if not prices:
             return []
 
-        now = datetime.now(timezone.utc)
+        now_ts = time.time()
+        # only built if something fires
+        now: Optional[datetime] = None
         events: List[AlertEvent] = []
 
-        price_by_symbol = {p.symbol.upper(): p for p in prices}
-
-        for rule in self._rules.values():
-            if not rule.enabled:
-                continue
-
-            p = price_by_symbol.get(rule.symbol.upper())
-            if p is None:
-                continue
+        op_fns = self._op_fns
 
+        for p in prices:
             current_price = p.price
-            if not self._condition_met(rule, current_price):
-                continue
 
-            if not self._can_trigger(rule, now):
-                continue
+            for rule in self._rules_by_symbol.get(p.symbol.upper(), ()):
+                if not rule.enabled:
+                    continue
+
+                if not op_fns[rule.id](current_price, rule.threshold):
+                    continue
 
-            msg = f"{rule.symbol} {rule.operator} {rule.threshold} (now {current_price:.2f})"
+                if not self._can_trigger(rule, now_ts):
+                    continue
 
-            rule.last_triggered = now
+                msg = f"{rule.symbol} {rule.operator} {rule.threshold} (now {current_price:.2f})"
 
-            event = AlertEvent(
-                rule_id=rule.id,
-                symbol=rule.symbol,
-                price=current_price,
-                triggered_at=now,
-                message=msg,
-            )
-            events.append(event)
-            self._events.append(event)
+                self._last_ts[rule.id] = now_ts
+                if now is None:
+                    now = datetime.fromtimestamp(now_ts, timezone.utc)
 
-        # keep last 50 events
-        if len(self._events) > 50:
-            self._events = self._events[-50:]
+                event = AlertEvent(
+                    rule_id=rule.id,
+                    symbol=rule.symbol,
+                    price=current_price,
+                    triggered_at=now,
+                    message=msg,
+                )
+                events.append(event)
+                self._events.append(event)
 
         return events
 
@@ -1,16 +1,20 @@
-import json
 import os
 import time
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi.encoders import jsonable_encoder
+import orjson
+from pydantic import TypeAdapter
 
 from models import StockPrice
 
 try:
-    import redis  # type: ignore
+    import redis.asyncio as aioredis  # type: ignore
 except ImportError:  # redis optional for local runs
-    redis = None
+    aioredis = None
+
+
+# compiled once; validates the cached JSON straight into StockPrice objects
+_PRICE_LIST = TypeAdapter(List[StockPrice])
 
 
 class PriceCache:
@@ -19,79 +23,86 @@ class PriceCache:
     of the latest stock prices.
 
     We store a single key that contains:
-        {"ts": <unix_epoch>, "data": [ StockPrice as dict ... ]}
+        [ StockPrice as dict ... ]
+    written with SETEX, so Redis expires it server-side once it is older
+    than ``ttl_seconds``; a missing key simply means "no fresh snapshot".
     """
 
-    def __init__(self, redis_url: Optional[str] = None, key: str = "prices:snapshot"):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        key: str = "prices:snapshot",
+        ttl_seconds: int = 15,
+    ):
         self.key = key
-        self._local_cache: Optional[dict] = None
+        self.ttl_seconds = ttl_seconds
+        # in-process copy of the last snapshot written by this process:
+        # (unix_epoch, prices). Served directly while fresh, so repeated
+        # reads skip Redis and JSON decoding entirely.
+        self._local_cache: Optional[Tuple[float, List[StockPrice]]] = None
 
-        redis_url = redis_url or os.getenv("REDIS_URL", "redis://redis:6379/0")
+        self._redis_url = redis_url or os.getenv("REDIS_URL", "redis://redis:6379/0")
         self._client = None
 
-        if redis is not None:
-            try:
-                self._client = redis.Redis.from_url(redis_url, decode_responses=True)
-                self._client.ping()
-                print(f"[cache] Using Redis cache at {redis_url}")
-            except Exception as e:
-                print(f"[cache] Failed to connect to Redis ({e}); falling back to in-memory cache.")
-                self._client = None
+        if aioredis is not None:
+            self._client = aioredis.from_url(self._redis_url)
         else:
             print("[cache] redis package not installed; using in-memory cache only.")
 
-    # ----------------- public API -----------------
+    async def connect(self) -> None:
+        """
+        Check the Redis connection once at startup and drop to the
+        in-memory cache if it is unreachable.
+        """
+        if self._client is None:
+            return
 
-    def set_snapshot(self, prices: List[StockPrice]) -> None:
-        payload = {
-            "ts": time.time(),
-            "data": jsonable_encoder(prices),
-        }
-        blob = json.dumps(payload)
+        try:
+            await self._client.ping()
+            print(f"[cache] Using Redis cache at {self._redis_url}")
+        except Exception as e:
+            print(f"[cache] Failed to connect to Redis ({e}); falling back to in-memory cache.")
+            self._client = None
 
+    async def close(self) -> None:
         if self._client is not None:
-            try:
-                # small TTL, after that it is treated as a miss
-                self._client.set(self.key, blob, ex=60)
-                return
-            except Exception as e:
-                print(f"[cache] Redis set failed, falling back to local cache: {e}")
+            await self._client.aclose()
+            self._client = None
+
+    # ----------------- public API -----------------
 
-        # local fallback
-        self._local_cache = payload
+    async def set_snapshot(self, prices: List[StockPrice]) -> None:
+        self._local_cache = (time.time(), list(prices))
 
-    def get_snapshot(self, max_age_seconds: int = 15) -> Optional[List[StockPrice]]:
-        # First try Redis
-        raw = None
         if self._client is not None:
+            data = [p.model_dump(mode="json") for p in prices]
             try:
-                raw = self._client.get(self.key)
+                await self._client.setex(self.key, self.ttl_seconds, orjson.dumps(data))
             except Exception as e:
-                print(f"[cache] Redis get failed, falling back to local cache: {e}")
-                raw = None
+                print(f"[cache] Redis set failed, using local cache only: {e}")
+
+    async def get_snapshot(self) -> Optional[List[StockPrice]]:
+        # First try the in-process copy
+        if self._local_cache is not None:
+            ts, prices = self._local_cache
+            if time.time() - ts <= self.ttl_seconds:
+                return list(prices)
 
-        # If Redis miss / disabled, use local cache
-        if raw is None and self._local_cache is not None:
-            payload = self._local_cache
-        elif raw is None:
+        # Then Redis (snapshot written by another process)
+        if self._client is None:
             return None
-        else:
-            try:
-                payload = json.loads(raw)
-            except Exception:
-                return None
 
-        ts = payload.get("ts")
-        data = payload.get("data", [])
-        if ts is None:
+        try:
+            raw = await self._client.get(self.key)
+        except Exception as e:
+            print(f"[cache] Redis get failed: {e}")
             return None
 
-        age = time.time() - float(ts)
-        if age > max_age_seconds:
+        if raw is None:
             return None
 
         try:
-            return [StockPrice(**item) for item in data]
+            return _PRICE_LIST.validate_json(raw)
         except Exception as e:
             print(f"[cache] Failed to hydrate StockPrice objects from cache: {e}")
             return None
@@ -1,17 +1,19 @@
 import asyncio
+import json
 from typing import List, Set
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.requests import Request
+from fastapi.responses import ORJSONResponse
 
 from models import StockPrice, PriceUpdateMessage, AlertRule, AlertEvent
-from stocks_service import StockPriceProvider
+from stocks_service import StockPriceProvider, close_http_client
 from cache_service import PriceCache
 from alert_service import AlertManager
 from webex_service import WebexNotifier
 
-app = FastAPI(title="SmartStock Monitor Backend")
+app = FastAPI(title="SmartStock Monitor Backend", default_response_class=ORJSONResponse)
 
 # Allow the frontend (served by nginx or file://) to talk to the API.
 app.add_middleware(
@@ -62,15 +64,20 @@ class ConnectionManager:
             self.active.remove(websocket)
             print(f"[ws] client disconnected, total={len(self.active)}")
 
-    async def broadcast_json(self, payload):
-        disconnected: List[WebSocket] = []
-        for ws in list(self.active):
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                disconnected.append(ws)
-        for ws in disconnected:
-            self.disconnect(ws)
+    async def broadcast_text(self, frame: str):
+        """
+        Send an already-serialized frame to every client, so the payload
+        is encoded once per tick rather than once per connection.
+        """
+        clients = list(self.active)
+        # send concurrently so one slow client does not delay the rest
+        results = await asyncio.gather(
+            *(ws.send_text(frame) for ws in clients),
+            return_exceptions=True,
+        )
+        for ws, result in zip(clients, results):
+            if isinstance(result, Exception):
+                self.disconnect(ws)
 
 
 manager = ConnectionManager()
@@ -87,13 +94,7 @@ async def get_prices_once():
     """
     REST endpoint mainly for debugging; the UI uses WebSockets instead.
     """
-    cached = price_cache.get_snapshot()
-    if cached:
-        return cached
-
-    prices = price_provider.get_prices()
-    price_cache.set_snapshot(prices)
-    return prices
+    return await _latest_prices()
 
 
 @app.get("/alerts/rules", response_model=List[AlertRule])
@@ -109,56 +110,113 @@ async def add_alert_rule(rule: AlertRule = Body(...)):
 
 @app.get("/alerts/events", response_model=List[AlertEvent])
 async def get_recent_events():
-    return alert_manager.recent_events()
+    # polled by the UI every 5s; returning a Response skips the
+    # response_model validation pass (the schema is still documented)
+    return ORJSONResponse([e.model_dump(mode="json") for e in alert_manager.recent_events()])
 
 
 # -------- websocket helpers --------
+BROADCAST_INTERVAL_SECONDS = 10
+
+# strong references to fire-and-forget tasks so they are not GC'd mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _price_frame(prices: List[StockPrice]) -> str:
+    """
+    Serialize a snapshot into a websocket text frame. The StockPrice
+    objects are already validated, so skip re-validating the wrapper.
+    """
+    return PriceUpdateMessage.model_construct(data=prices).model_dump_json()
+
+
+async def _latest_prices() -> List[StockPrice]:
+    """
+    Cached snapshot if still fresh, otherwise fetch from the provider
+    and refresh the cache.
+    """
+    prices = await price_cache.get_snapshot()
+    if prices is None:
+        prices = await price_provider.get_prices()
+        await price_cache.set_snapshot(prices)
+    return prices
+
+
+async def _notify_webex(events: List[AlertEvent]):
+    await asyncio.gather(*(webex_notifier.send_alert_async(e) for e in events))
+
+
 async def _compute_and_broadcast_prices():
     """
-    Helper used by the websocket loop: get latest prices (cache + provider),
+    One tick of the price loop: get latest prices (cache + provider),
     update cache, run alert engine, send everything to clients.
     """
-    prices = price_cache.get_snapshot()
-    if prices is None:
-        prices = price_provider.get_prices()
-        price_cache.set_snapshot(prices)
+    prices = await _latest_prices()
 
-    # send price update (ensure datetimes are JSON-serializable)
-    msg = PriceUpdateMessage(data=prices)
-    await manager.broadcast_json(msg.model_dump(mode="json"))
+    # serialize once, fan out the same frame to every client
+    frame = _price_frame(prices)
+    await manager.broadcast_text(frame)
 
     # evaluate alerts
     events = alert_manager.evaluate(prices)
+    if events:
+        # send to WebEx (if configured) without holding up the price loop
+        task = asyncio.create_task(_notify_webex(events))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
     for event in events:
-        # send to WebEx (if configured)
-        webex_notifier.send_alert(event)
         # broadcast alert to clients
-        await manager.broadcast_json({
+        await manager.broadcast_text(json.dumps({
             "type": "alert",
             "rule_id": event.rule_id,
             "symbol": event.symbol,
             "price": event.price,
             "triggered_at": event.triggered_at.isoformat(),
             "message": event.message,
-        })
+        }))
+
+
+async def price_broadcaster():
+    """
+    Single background producer: every BROADCAST_INTERVAL_SECONDS update
+    prices and alerts for all connected clients.
+    """
+    while True:
+        if manager.active:
+            try:
+                await _compute_and_broadcast_prices()
+            except Exception as e:
+                print(f"[ws] Unexpected error in price_broadcaster: {e}")
+        await asyncio.sleep(BROADCAST_INTERVAL_SECONDS)
+
+
+@app.on_event("startup")
+async def on_startup():
+    await price_cache.connect()
+    app.state.price_broadcaster = asyncio.create_task(price_broadcaster())
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    app.state.price_broadcaster.cancel()
+    await close_http_client()
+    await price_cache.close()
+    await webex_notifier.close()
 
 
 @app.websocket("/ws/prices")
 async def websocket_prices(websocket: WebSocket):
     await manager.connect(websocket)
 
-    # On connect, send cached snapshot immediately if available
-    cached = price_cache.get_snapshot()
-    if cached:
-        snapshot_msg = PriceUpdateMessage(data=cached)
-        # IMPORTANT: mode="json" so datetime -> ISO string
-        await websocket.send_json(snapshot_msg.model_dump(mode="json"))
-
     try:
-        # Simple loop: every 10 seconds update prices and alerts
+        # On connect, send a snapshot immediately; the broadcaster idles while
+        # nobody is connected, so the cache may be cold and need a fetch.
+        await websocket.send_text(_price_frame(await _latest_prices()))
+
+        # Updates are pushed by price_broadcaster; just wait for the client to go away.
         while True:
-            await _compute_and_broadcast_prices()
-            await asyncio.sleep(10)
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
@@ -1,10 +1,12 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class StockPrice(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     symbol: str
     price: float
     change: float
@@ -13,6 +15,8 @@ class StockPrice(BaseModel):
 
 
 class PriceUpdateMessage(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     type: str = "price_update"
     data: List[StockPrice]
 
@@ -20,7 +24,12 @@ class PriceUpdateMessage(BaseModel):
 class AlertRule(BaseModel):
     """
     A single alert rule such as "AAPL > 200".
+
+    Rules are immutable; AlertManager tracks when each one last fired
+    and fills in last_triggered when listing them.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: int
     symbol: str
     operator: str  # ">" or "<"
@@ -35,6 +44,8 @@ class AlertEvent(BaseModel):
     """
     A concrete alert firing at a specific time.
     """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     rule_id: int
     symbol: str
     price: float
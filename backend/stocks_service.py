@@ -1,20 +1,39 @@
-import json
+import asyncio
 import os
 import random
 from datetime import datetime, timezone
-from typing import List
-from urllib.error import HTTPError, URLError
-from urllib.request import urlopen
+from typing import Dict, List
+
+import httpx
 
 from models import StockPrice
 
 DEFAULT_SYMBOLS = ["AAPL", "TSLA", "NVDA", "MSFT"]
 
+# Rough base prices the mock feed jitters around.
+MOCK_BASE_PRICES = {
+    "AAPL": 190,
+    "TSLA": 180,
+    "NVDA": 1100,
+    "MSFT": 420,
+}
+
 # Global switch for mock mode.
 # Set this to True if you want the backend to use ONLY mock data
 # (no Finnhub calls).
 USE_MOCK_PRICES = False  # you can toggle this for demos
 
+# Shared client so quote requests reuse keep-alive connections.
+_http_client = httpx.AsyncClient(
+    timeout=5,
+    limits=httpx.Limits(max_keepalive_connections=8),
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared Finnhub client; called on app shutdown."""
+    await _http_client.aclose()
+
 
 class StockPriceProvider:
     """
@@ -28,6 +47,8 @@ class StockPriceProvider:
     def __init__(self, symbols: List[str] | None = None):
         self.symbols = symbols or DEFAULT_SYMBOLS
         self.api_key = os.getenv("FINNHUB_TOKEN")
+        # symbol -> in-flight Finnhub request, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
         if not self.api_key:
             print("[stocks_service] FINNHUB_TOKEN not set; falling back to mock prices only.")
             global USE_MOCK_PRICES
@@ -38,13 +59,13 @@ class StockPriceProvider:
     def _finnhub_url(self, symbol: str) -> str:
         return f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={self.api_key}"
 
-    def _fetch_symbol_from_finnhub(self, symbol: str, now: datetime) -> StockPrice:
+    async def _fetch_symbol_from_finnhub(self, symbol: str, now: datetime) -> StockPrice:
         if not self.api_key:
             raise RuntimeError("FINNHUB_TOKEN not configured")
 
-        url = self._finnhub_url(symbol)
-        with urlopen(url, timeout=5) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
+        resp = await _http_client.get(self._finnhub_url(symbol))
+        resp.raise_for_status()
+        payload = resp.json()
 
         # Finnhub /quote fields:
         # c: current price
@@ -63,15 +84,24 @@ class StockPriceProvider:
             ts=now,
         )
 
+    async def _get_symbol_quote(self, symbol: str, now: datetime) -> StockPrice:
+        """
+        Finnhub quote for ``symbol``. Callers that miss at the same time
+        (e.g. the broadcaster and /api/prices) await one shared request, so
+        its ``ts`` is the ``now`` of whichever caller started it.
+        """
+        task = self._inflight.get(symbol)
+        if task is None:
+            task = asyncio.create_task(self._fetch_symbol_from_finnhub(symbol, now))
+            self._inflight[symbol] = task
+            task.add_done_callback(lambda _: self._inflight.pop(symbol, None))
+        # shield: one caller being cancelled must not cancel the others' fetch
+        return await asyncio.shield(task)
+
     # --------------- mock helpers ---------------
 
     def _mock_price_value(self, symbol: str) -> float:
-        base = {
-            "AAPL": 190,
-            "TSLA": 180,
-            "NVDA": 1100,
-            "MSFT": 420,
-        }.get(symbol.upper(), 100)
+        base = MOCK_BASE_PRICES.get(symbol.upper(), 100)
 
         jitter = random.uniform(-3, 3)
         return max(base + jitter, 1)
@@ -94,20 +124,26 @@ class StockPriceProvider:
 
     # --------------- public API ---------------
 
-    def get_prices(self) -> List[StockPrice]:
+    async def get_prices(self) -> List[StockPrice]:
         now = datetime.now(timezone.utc)
 
         # FULL MOCK MODE: no external API at all
         if USE_MOCK_PRICES:
             return self._fallback_snapshot(now)
 
+        # fetch all symbols concurrently; failures come back as exceptions
+        results = await asyncio.gather(
+            *(self._get_symbol_quote(sym, now) for sym in self.symbols),
+            return_exceptions=True,
+        )
+
         prices: List[StockPrice] = []
 
-        for sym in self.symbols:
-            try:
-                prices.append(self._fetch_symbol_from_finnhub(sym, now))
-            except (HTTPError, URLError, RuntimeError, ValueError, Exception) as e:
-                print(f"[stocks_service] Finnhub failed for {sym}, fallback used: {e}")
+        for sym, result in zip(self.symbols, results):
+            if isinstance(result, Exception):
+                print(f"[stocks_service] Finnhub failed for {sym}, fallback used: {result}")
                 prices.append(self._fallback_price(sym, now))
+            else:
+                prices.append(result)
 
         return prices
@@ -1,8 +1,8 @@
-import json
 import os
 from typing import Optional
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+
+import httpx
+import orjson
 
 from models import AlertEvent
 
@@ -19,12 +19,25 @@ class WebexNotifier:
     logs what it *would* have sent.
     """
 
+    MESSAGE_TEMPLATE = "🚨 Stock Alert: {symbol}\n{message}\nTriggered at {triggered_at}"
+
     def __init__(self, bot_token: Optional[str], room_id: Optional[str]):
         self.bot_token = bot_token
         self.room_id = room_id
+        self._session: Optional[httpx.AsyncClient] = None
 
         if not self.bot_token or not self.room_id:
             print("[webex] WARNING: WebEx not fully configured; alerts will be logged only.")
+        else:
+            # one pooled client so consecutive alerts reuse the TLS connection
+            self._session = httpx.AsyncClient(
+                base_url="https://webexapis.com",
+                headers={
+                    "Authorization": f"Bearer {self.bot_token}",
+                    "Content-Type": "application/json",
+                },
+                timeout=5,
+            )
 
     @classmethod
     def from_env(cls) -> "WebexNotifier":
@@ -37,40 +50,40 @@ class WebexNotifier:
     def is_configured(self) -> bool:
         return bool(self.bot_token and self.room_id)
 
-    def send_alert(self, event: AlertEvent) -> None:
-        """
-        Post a simple message into the configured WebEx room.
-        """
-        if not self.is_configured():
-            print(f"[webex] (dry-run) Would send alert to WebEx: {event.message}")
-            return
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
 
-        url = "https://webexapis.com/v1/messages"
-        headers = {
-            "Authorization": f"Bearer {self.bot_token}",
-            "Content-Type": "application/json",
-        }
-
-        text = (
-            f"🚨 Stock Alert: {event.symbol}\n"
-            f"{event.message}\n"
-            f"Triggered at {event.triggered_at.isoformat()}"
+    def _build_message_text(self, event: AlertEvent) -> str:
+        return self.MESSAGE_TEMPLATE.format(
+            symbol=event.symbol,
+            message=event.message,
+            triggered_at=event.triggered_at.isoformat(),
         )
+
+    def _build_body(self, event: AlertEvent) -> bytes:
         payload = {
             "roomId": self.room_id,
-            "text": text,
+            "text": self._build_message_text(event),
         }
+        return orjson.dumps(payload)
 
-        data = json.dumps(payload).encode("utf-8")
-        req = Request(url, data=data, headers=headers, method="POST")
+    async def send_alert_async(self, event: AlertEvent) -> None:
+        """
+        Post a simple message into the configured WebEx room.
+        """
+        if not self.is_configured():
+            print(f"[webex] (dry-run) Would send alert to WebEx: {event.message}")
+            return
 
         try:
-            with urlopen(req, timeout=5) as resp:
-                resp.read()
+            resp = await self._session.post("/v1/messages", content=self._build_body(event))
+            resp.raise_for_status()
             print(f"[webex] Alert sent to WebEx for rule {event.rule_id} ({event.symbol}).")
-        except HTTPError as e:
-            print(f"[webex] HTTP error sending alert to WebEx: {e.code} {e.reason}")
-        except URLError as e:
-            print(f"[webex] Network error sending alert to WebEx: {e.reason}")
+        except httpx.HTTPStatusError as e:
+            print(f"[webex] HTTP error sending alert to WebEx: {e.response.status_code} {e.response.reason_phrase}")
+        except httpx.RequestError as e:
+            print(f"[webex] Network error sending alert to WebEx: {e}")
         except Exception as e:
             print(f"[webex] Unexpected error sending alert to WebEx: {e}")